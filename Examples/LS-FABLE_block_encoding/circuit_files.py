@@ -7,94 +7,128 @@ import numpy as np
 import scipy as sp
 import random
 import cirq
+import functools
 import time
 
 
 #build full LS-FABLE circuit from sparse matrix description
 def LS_FALBE_full(i1,i2,v,n):
-	oracle = LS_orace_from_sparse(i2,i1,v,n)
-	fable_circ = oracle_surround(oracle,n)
-	final_circ = sparse_surround(fable_circ,n)
+	#keep the sparse description as contiguous arrays for the whole pipeline
+	i1 = np.ascontiguousarray(i1, dtype=np.int64)
+	i2 = np.ascontiguousarray(i2, dtype=np.int64)
+	v = np.ascontiguousarray(v, dtype=np.float64)
+	q = cirq.LineQubit.range(2*n + 1)
+	oracle = LS_oracle_ops_from_sparse(i2,i1,v,n,q)
+	fable_circ = oracle_surround(oracle,n,q)
+	final_circ = sparse_surround(fable_circ,n,q)
 	return(final_circ)
 	
 	
 
 
 #builds oracle from structure and rotations
-def oracle_from_struc(struc, v, n):
-	circuit = cirq.Circuit()
-	q = cirq.LineQubit.range(2*n + 1)
-	circuit.append(cirq.Ry(rads=np.pi)(q[0]))
-	L = len(struc)
+def oracle_from_struc(struc, v, n, q=None):
+	return(cirq.Circuit(oracle_ops_from_struc(struc, v, n, q)))
+
+
+#streams oracle operations from structure and rotations
+#every operation acts on q[0] so the oracle is strictly sequential
+def oracle_ops_from_struc(struc, v, n, q=None):
+	if q is None:
+		q = cirq.LineQubit.range(2*n + 1)
+	ry = cirq.ry
+	t = q[0]
+	#rotation angles and CNOT control indices computed in one pass each
+	struc = np.asarray(struc, dtype=np.int64)
+	angles = ((-2.0/(2**n)) * np.asarray(v, dtype=np.float64)).tolist()
+	targets = np.where(struc != 0, 2*n + 1 - struc, 0).tolist()
+	#only 2n distinct CNOTs appear in the oracle so each is built once
+	CNOT_ops = [None] + [cirq.CNOT(q[j],t) for j in range(1, 2*n + 1)]
+	yield ry(np.pi).on(t)
 	i = 0
-	for x in range(L):
-		if struc[x] == 0:
-			a = -2*v[i]/(2**n)
-			circuit.append(cirq.Ry(rads=a)(q[0]))
+	for j in targets:
+		if j == 0:
+			yield ry(angles[i]).on(t)
 			i += 1
 		else:
-			j = 2*n + 1 - struc[x]
-			circuit.append(cirq.CNOT(q[j],q[0]))
-	return(circuit)
+			yield CNOT_ops[j]
 
 
 #build LS-FABLE oracle from sparse matrix description
-def LS_orace_from_sparse(i1,i2,v,n):
+def LS_orace_from_sparse(i1,i2,v,n,q=None):
+	return(cirq.Circuit(LS_oracle_ops_from_sparse(i1,i2,v,n,q)))
+
+
+#stream LS-FABLE oracle operations from sparse matrix description
+def LS_oracle_ops_from_sparse(i1,i2,v,n,q=None):
 	N = 2**n
 	I = two_to_one_index(i1,i2,N)
 	[I1,v1] = convert_mat_to_gray(I,v,n)
 	C = cnot_base_structure(I1,n)
-	circuit = oracle_from_struc(C, v1, n)
-	return(circuit)
+	return(oracle_ops_from_struc(C, v1, n, q))
+
+
+#hadamard and swap layers act on disjoint qubits so each is a single moment
+#cached per register as consecutive builds usually reuse the same n
+@functools.lru_cache(maxsize=8)
+def surround_moments(q,n):
+	H = cirq.H
+	SWAP = cirq.SWAP
+	H_moment = cirq.Moment(H(q[x+1]) for x in range(n))
+	SWAP_moment = cirq.Moment(SWAP(q[x+1],q[x+n+1]) for x in range(n))
+	return(H_moment, SWAP_moment)
 
 
 #surround oracle with FABLE gates
-def oracle_surround(circuit,n):
-	big_H = cirq.Circuit()
-	big_SWAP = cirq.Circuit()
-	q = cirq.LineQubit.range(2*n + 1)
-	for x in range(n):
-		big_H.append(cirq.H(q[x+1]))
-		big_SWAP.append(cirq.SWAP(q[x+1],q[x+n+1]))
-	new_circuit = big_H[:]
-	new_circuit.append(circuit)
-	new_circuit.append(big_SWAP)
-	new_circuit.append(big_H)
+#accepts an oracle circuit or a stream of sequential oracle operations,
+#each streamed operation is placed in its own moment
+def oracle_surround(circuit,n,q=None):
+	if q is None:
+		q = cirq.LineQubit.range(2*n + 1)
+	H_moment, SWAP_moment = surround_moments(tuple(q),n)
+	new_circuit = cirq.Circuit.from_moments(H_moment, *circuit, SWAP_moment, H_moment)
 	return(new_circuit)
 
 
 #surround FABLE circuit with 0-controlled H gate for sparse
-def sparse_surround(c,n):
-	circuit = cirq.Circuit()
-	circuit.append(big_CH(n))
-	circuit.append(c)
-	circuit.append(big_CH(n))
+def sparse_surround(c,n,q=None):
+	if q is None:
+		q = cirq.LineQubit.range(2*n + 1)
+	CH = frozen_big_CH(tuple(q),n)
+	circuit = cirq.Circuit.from_moments(*CH, *c, *CH)
 	return(circuit)
 
 
 #build multi-controlled single H gates
-def single_CH(b,n):
-	big_H = cirq.Circuit()
-	q = cirq.LineQubit.range(2*n + 1)
+def single_CH(b,n,q=None):
+	if q is None:
+		q = cirq.LineQubit.range(2*n + 1)
 	H_op = cirq.H(q[b])
 	for x in range(n+1):
 		H_op = H_op.controlled_by(q[x])
-	big_H.append(H_op)
-	return(big_H)
+	return(cirq.Circuit([H_op]))
 
 
 #build large 0-controlled H gate
-def big_CH(n):
-	big_H = cirq.Circuit()
-	big_X = cirq.Circuit()
-	q = cirq.LineQubit.range(2*n + 1)
-	for x in range(n+1):
-		big_X.append(cirq.X(q[x]))
-	big_H.append(big_X)
-	for x in range(n):
-		big_H.append(single_CH(x+n+1,n))
-	big_H.append(big_X)
-	return(big_H)
+def big_CH(n,q=None):
+	if q is None:
+		q = cirq.LineQubit.range(2*n + 1)
+	return(frozen_big_CH(tuple(q),n).unfreeze())
+
+
+#large 0-controlled H gate depends only on the register so it is built once
+@functools.lru_cache(maxsize=8)
+def frozen_big_CH(q,n):
+	H = cirq.H
+	X = cirq.X
+	X_moment = cirq.Moment(X(q[x]) for x in range(n+1))
+	CH_ops = []
+	for b in range(n+1, 2*n + 1):
+		H_op = H(q[b])
+		for x in range(n+1):
+			H_op = H_op.controlled_by(q[x])
+		CH_ops.append(H_op)
+	return(cirq.FrozenCircuit(X_moment, CH_ops, X_moment))
 
 
 
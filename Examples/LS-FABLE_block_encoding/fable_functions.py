@@ -126,35 +126,43 @@ def cnot_eliminate(v):
 
 
 #build CNOT structure from gray
+#the CNOTs surviving cnot_eliminate between two rotations are the bits that
+#differ between their gray codes, and the gray code walk is cyclic so the
+#leading and trailing CNOTs are the bits of the first and last gray codes
 def cnot_base_structure(I,n):
-	N = 2**n
-	list1 = np.zeros(N**2).astype(int) - 1
-	list2 = gray_digit(n)
-	result = [None]*(len(list1)+len(list2))
-	result[::2] = list1
-	result[1::2] = list2
-	L = len(I)
-	for x in range(L):
-		i = 2*I[x]
-		result[i] = result[i] + 1
-	elim = [ele for ele in result if ele != -1]
-	elim1 = cnot_eliminate(elim)
-	return(elim1)
+	K = np.asarray(I, dtype=np.int64)
+	if len(K) == 0:
+		return(np.zeros(0, dtype=np.int64))
+	G = K ^ (K >> 1)
+	D = np.concatenate((G[:1], G[1:] ^ G[:-1], G[-1:]))
+	#unpack the low 2n bits of each difference straight from its bytes
+	D = D.astype('<u8').view(np.uint8).reshape(-1,8)
+	bits = np.unpackbits(D, axis=1, count=2*n, bitorder='little').view(bool)
+	#each row is the set CNOT controls in ascending order followed by a rotation marker
+	marker = np.ones((len(bits),1), dtype=bool)
+	marker[-1] = False
+	mask = np.hstack((bits, marker))
+	digits = np.append(np.arange(1, 2*n + 1), 0)
+	return(np.broadcast_to(digits, mask.shape)[mask])
+
+
+#position of each index in the gray code permutation (inverse gray code)
+#equivalent to gray_perm(n).index(I) but computed with a prefix xor
+def gray_position(I,n):
+	K = np.array(I, dtype=np.int64)
+	shift = 1
+	while shift < 2*n:
+		K ^= K >> shift
+		shift <<= 1
+	return(K)
 
 
 #convert sparse to gray
 def convert_mat_to_gray(I,v,n):
-	L = len(I)
-	G = gray_perm(n)
-	I1 = []
-	for x in range(L):
-		#I1.append(G[I[x]])
-		I1.append(G.index(I[x]))
-	i1 = sorted(range(L), key=lambda k: I1[k])
-	I1 = sorted(I1)
-	v1 = []
-	for x in range(L):
-		v1.append(v[i1[x]])
+	K = gray_position(I,n)
+	order = np.argsort(K, kind='stable')
+	I1 = K[order]
+	v1 = np.asarray(v, dtype=np.float64)[order]
 	return([I1,v1])	
 
 				
@@ -168,8 +176,7 @@ def one_to_two_index(I,N):
 
 #convert NxN index to N^2 index
 def two_to_one_index(i1,i2,N):
-	I1 = [x * N for x in i2]
-	I2 = np.add(I1,i1)
+	I2 = np.asarray(i2, dtype=np.int64) * N + np.asarray(i1, dtype=np.int64)
 	return(I2)
 	
 		
@@ -2,6 +2,7 @@
     deferred.py
     Bloqs that defer instantiation
 '''
+from collections import OrderedDict
 from typing import Dict, Iterator, Generator
 from types import FunctionType
 from numpy.typing import NDArray
@@ -84,9 +85,13 @@ class Cached(MetaBloq):
         Behaviour of overwriting the entire cache at the class level will 
         depend on whether it is instantiated as a slot with double indirection
         or as a per-instance reference in each vtable 
+
+        The cache holds at most SINGLETON_CACHE_SIZE tags, evicting the least
+        recently used tag when full
     '''
 
-    SINGLETON_CACHE = {}
+    SINGLETON_CACHE = OrderedDict()
+    SINGLETON_CACHE_SIZE = 256
 
     def __init__(
                 self,
@@ -120,6 +125,13 @@ class Cached(MetaBloq):
         '''
         return f'CACHE'
 
+    @classmethod
+    def clear_cache(cls):
+        '''
+            Empties the singleton cache
+        '''
+        cls.SINGLETON_CACHE.clear()
+
     def compose(self) -> Generator[
             qualtran.Bloq | cirq.Gate | cirq.Circuit,
             None,
@@ -128,14 +140,20 @@ class Cached(MetaBloq):
         '''
         Dispatch method for decomposer
         '''
-        cache_entry = Cached.SINGLETON_CACHE.get(self.tag, None)
+        cache = Cached.SINGLETON_CACHE
+        cache_entry = cache.get(self.tag, None)
     
         if cache_entry is None:
             bloq = self.subbloq_gen(
                 *self.args,
                 **self.kwargs
             )
-            Cached.SINGLETON_CACHE[self.tag] = bloq
+            cache[self.tag] = bloq
+
+            # Evict the least recently used tag
+            if len(cache) > Cached.SINGLETON_CACHE_SIZE:
+                cache.popitem(last=False)
             yield bloq
         else:
+            cache.move_to_end(self.tag)
             yield cache_entry
@@ -3,6 +3,7 @@
     Contains the Repeat meta-bloq
     Also contains a helper function circuit_to_quregs
 '''
+from itertools import chain, repeat
 from typing import Dict, Iterator, Generator 
 from types import FunctionType
 from numpy.typing import NDArray
@@ -14,14 +15,27 @@ from qualtran._infra.registers import Signature
 
 from pyLIQTR.utils.meta import MetaBloq 
 
+# Frozen circuits repeated at least this many times are cached by default
+CIRCUIT_CACHING_THRESHOLD = 4
 
-def circuit_to_quregs(circuit: cirq.Circuit) -> dict:
+# Decomposer for each supported subbloq base type, checked in order
+_DECOMPOSERS = (
+    (qualtran.Bloq, '_qualtran_bloq_decomp'),
+    (cirq.Gate, '_cirq_gate_decomp'),
+    (cirq.AbstractCircuit, '_cirq_circuit_decomp'),
+)
+
+# Resolved decomposer names, keyed by concrete subbloq type
+_DECOMPOSER_CACHE: Dict[type, str] = {}
+
+
+def circuit_to_quregs(circuit: cirq.AbstractCircuit) -> dict:
     '''
         Extracts quregs from a circuit
         Uses the same ordering as the
          CompositeBloq methods, allowing for
         preservation of argument order
-        :: circuit : cirq.Circuit :: Circuit
+        :: circuit : cirq.AbstractCircuit :: Circuit
     '''
     all_qubits = sorted(circuit.all_qubits())
     return {'qubits': [[i] for i in all_qubits]}
@@ -36,10 +50,10 @@ class Repeat(MetaBloq):
     #pylint: disable=too-many-instance-attributes
     def __init__(
                 self,
-                subbloq: qualtran.Bloq | cirq.Gate | cirq.Circuit,
+                subbloq: qualtran.Bloq | cirq.Gate | cirq.AbstractCircuit,
                 *args,
                 n_repetitions: int = 1,
-                caching: bool = False,
+                caching: bool | None = None,
                 **kwargs
             ):
         '''
@@ -47,7 +61,9 @@ class Repeat(MetaBloq):
             :: subbloq : GateWithRegisters | cirq.Gate :: Object to repeat
             :: *args :: Positional arguments
             :: n_repetitions : int :: Number of times to repeat the object
-            :: caching : bool :: Whether the repeated object should be cached
+            :: caching : bool | None :: Whether the repeated object should be
+                                        cached, defaults to caching heavily
+                                        repeated frozen circuits
             :: quregs : dict :: Map back to cirq qubit labels for qualtran bloq
         '''
 
@@ -58,26 +74,37 @@ class Repeat(MetaBloq):
 
         # Caches the circuit between iterations
         # Should only be used if the repeated object is small or constant
+        # Frozen circuits cannot change between repetitions, so heavily
+        # repeated frozen circuits are cached unless caching is set
+        if caching is None:
+            caching = (
+                n_repetitions >= CIRCUIT_CACHING_THRESHOLD
+                and isinstance(subbloq, cirq.FrozenCircuit)
+            )
         self.caching = caching
         self._cached = None
 
         # Dynamic dispatch
         # Sets different decomposers depending on the input
-        self._decompose = None
-
-        if issubclass(type(subbloq), qualtran.Bloq):
-            self._decompose = self._qualtran_bloq_decomp
-
-        elif issubclass(type(subbloq), cirq.Gate):
-            self._decompose = self._cirq_gate_decomp
-
-        elif issubclass(type(subbloq), cirq.Circuit):
-            self._decompose = self._cirq_circuit_decomp
-
-        else:
-            raise TypeError(
-                f"{subbloq} is not a qualtran.Bloq, cirq.Gate or cirq.Circuit"
+        # Resolution is cached per type to skip repeated MRO walks
+        subbloq_type = type(subbloq)
+        decomposer = _DECOMPOSER_CACHE.get(subbloq_type)
+
+        if decomposer is None:
+            decomposer = next(
+                (
+                    name for base, name in _DECOMPOSERS
+                    if issubclass(subbloq_type, base)
+                ),
+                None
             )
+            if decomposer is None:
+                raise TypeError(
+                    f"{subbloq} is not a qualtran.Bloq, cirq.Gate or cirq circuit"
+                )
+            _DECOMPOSER_CACHE[subbloq_type] = decomposer
+
+        self._decompose = getattr(self, decomposer)
 
     @property
     def signature(self) -> Signature:
@@ -154,19 +181,22 @@ class Repeat(MetaBloq):
             Uses the subbloq's decomposition function and repeats the output
         '''
         if self.caching:
-            cached_obj = list(
+            # Materialised as a tuple so that every repetition replays it
+            ops = tuple(
                 self.subbloq.decompose_from_registers(
                     *args,
-                    context,
-                    quregs
+                    context=context,
+                    **quregs
                 )
             )
-            ops = iter(cached_obj)
+            yield from chain.from_iterable(repeat(ops, self.n_repetitions))
         else:
-            ops = self.subbloq.decompose_from_registers(*args, context, quregs)
-
-        for _ in range(self.n_repetitions):
-            yield from ops
+            for _ in range(self.n_repetitions):
+                yield from self.subbloq.decompose_from_registers(
+                    *args,
+                    context=context,
+                    **quregs
+                )
 
     #pylint: disable=arguments-differ, unused-argument
     def _decompose_with_context_(self, *, context=None, **kwargs) -> Generator[
@@ -190,8 +220,14 @@ class Repeat(MetaBloq):
         Dispatch method for decomposer
         Dynamic dispatch is set in the constructor
         '''
-        for _ in range(self.n_repetitions):
-            yield from self.decompose_once()
+        if self.caching:
+            # Replay the cached decomposition without re-entering the decomposer
+            yield from chain.from_iterable(
+                repeat(self._cached_decomposition(), self.n_repetitions)
+            )
+        else:
+            for _ in range(self.n_repetitions):
+                yield from self._decompose()
 
     def __iter__(self) -> Generator[
             qualtran.Bloq | cirq.Gate | cirq.Circuit,
@@ -209,14 +245,20 @@ class Repeat(MetaBloq):
             Returns a single decomposition
         '''
         if self.caching:
-            if self._cached is None:
-                self._cached = tuple(self._decompose())
-            decomp = self._cached
+            decomp = self._cached_decomposition()
         else:
             decomp = self._decompose()
 
         yield from decomp
 
+    def _cached_decomposition(self) -> tuple:
+        '''
+            Populates and returns the cached single decomposition
+        '''
+        if self._cached is None:
+            self._cached = tuple(self._decompose())
+        return self._cached
+
     def get_n_repetitions(self):
         '''
            Getter method
@@ -248,22 +290,23 @@ class Parameterised(MetaBloq):
                 self,
                 subbloq_gen: FunctionType,
                 *args,
-                caching: bool = False,
                 **kwargs
             ):
         '''
             Constructor for the Parameterised tagged Bloq 
             :: subbloq_gen : FunctionType :: Constructor for the gate   
-            :: caching : bool :: Whether the repeated object should be cached
-            :: quregs : dict :: Map back to cirq qubit labels for qualtran bloq
+            :: *args :: Args bound to the constructor ahead of the parameters
+            :: **kwargs :: Kwargs bound to the constructor, including any
+                           caching option for the generated bloq
         '''
         self.subbloq_gen = subbloq_gen
 
         self.bound_args = args
         self.bound_kwargs = kwargs 
 
-        self.args = None 
-        self.kwargs = None 
+        # Parameters are empty until bound
+        self.args = ()
+        self.kwargs = {}
 
     @property
     def signature(self) -> Signature:
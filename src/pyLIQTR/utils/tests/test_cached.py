@@ -35,7 +35,7 @@ class TestDeferredBloq(unittest.TestCase, TestHelpers):
         Generates a simple circuit to test on
         '''
         circ = cirq.Circuit()
-        q = [cirq.LineQubit(i) for i in range(n_qubits)]
+        q = TestDeferredBloq.line_qubits(n_qubits)
 
         for _ in range(n_repetitions):
             for i in range(n_qubits - 1):
@@ -70,7 +70,7 @@ class TestDeferredBloq(unittest.TestCase, TestHelpers):
                 
     def test_cirq_unary_gate(self, n_qubits=10):
 
-        q = [cirq.LineQubit(i) for i in range(n_qubits)]
+        q = self.line_qubits(n_qubits)
         target_gate = cirq.H
 
         gate = Cached('tag', target_gate, q[0])
@@ -86,6 +86,33 @@ class TestDeferredBloq(unittest.TestCase, TestHelpers):
 
             assert not (next(gate.compose()) == target_gate(q[i]))
 
+    def test_cache_eviction(self, n_qubits=4):
+        '''
+            Least recently used tags are evicted once the cache is full
+        '''
+        q = self.line_qubits(n_qubits)
+        target_gate = cirq.H
+
+        cache_size = Cached.SINGLETON_CACHE_SIZE
+        Cached.clear_cache()
+        Cached.SINGLETON_CACHE_SIZE = 2
+        try:
+            next(Cached('evict_0', target_gate, q[0]).compose())
+            next(Cached('evict_1', target_gate, q[1]).compose())
+
+            # Touch the first tag so the second is least recently used
+            next(Cached('evict_0', target_gate, q[2]).compose())
+            next(Cached('evict_2', target_gate, q[2]).compose())
+
+            assert list(Cached.SINGLETON_CACHE) == ['evict_0', 'evict_2']
+
+            # The evicted tag is rebuilt from its new arguments
+            gate = Cached('evict_1', target_gate, q[3])
+            assert next(gate.compose()) == target_gate(q[3])
+        finally:
+            Cached.SINGLETON_CACHE_SIZE = cache_size
+            Cached.clear_cache()
+
             
 #    def test_cirq_binary_gate(self, n_qubits=10):
 #        '''
@@ -2,10 +2,15 @@
     Common helper methods for tests
 '''
 
-import types
+import multiprocessing
 import typing
 import unittest
 
+from collections import defaultdict, deque
+from functools import lru_cache
+from itertools import chain, starmap, zip_longest
+from operator import eq
+
 import numpy
 import cirq
 from qualtran import CompositeBloq, BloqBuilder
@@ -13,20 +18,43 @@ from qualtran._infra.gate_with_registers import GateWithRegisters
 
 
 from pyLIQTR.utils.meta import MetaBloq
+from pyLIQTR.utils.repeat import Parameterised
 from pyLIQTR.utils.circuit_decomposition import circuit_decompose_multi
 from pyLIQTR.utils.circuit_decomposition import generator_decompose
 
+# Fill value for exhausted iterators, never equal to any gate or moment
+_EXHAUSTED = object()
+
+def _run_test(test_case: type, name: str):
+    '''
+        Runs a single named test on a fresh test case instance
+        Module level so that it can be dispatched to worker processes
+    '''
+    getattr(test_case(), name)()
+
 
-def extract_and_run_tests(tst: unittest.TestCase):
+def extract_and_run_tests(tst: unittest.TestCase, parallel: bool = False):
     '''
         Test runner without invoking subprocesses
+        :: tst : unittest.TestCase :: Test case to run
+        :: parallel : bool :: Runs each test in a separate worker process,
+                              at the cost of interactive and pdb hooks
     '''
-    # Extract test functions from tst object
-    for prop in dir(tst):
-        if prop[:4] == 'test':
-            obj = getattr(tst, prop)
-            if issubclass(type(obj), types.MethodType):
-                obj()
+    # Extract test functions from the test case class
+    # Filtering the class namespace avoids binding every TestCase attribute
+    names = [
+        name for name, fn in vars(type(tst)).items()
+        if name.startswith('test') and callable(fn)
+    ]
+
+    if parallel:
+        # Workers construct their own test case rather than pickling cirq state
+        with multiprocessing.get_context('spawn').Pool() as pool:
+            pool.starmap(_run_test, ((type(tst), name) for name in names))
+        return
+
+    for name in names:
+        getattr(tst, name)()
 
 class TestHelpers():
     '''
@@ -34,6 +62,16 @@ class TestHelpers():
         bloqs and circuits
     '''
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def line_qubits(n_qubits: int) -> tuple:
+        '''
+            Line of qubits shared between tests
+            Tests only use a handful of distinct sizes
+            :: n_qubits : int :: Number of qubits
+        '''
+        return tuple(cirq.LineQubit.range(n_qubits))
+
     @staticmethod
     def consume(iterable: typing.Iterable):
         '''
@@ -51,27 +89,68 @@ class TestHelpers():
         except StopIteration:
             return False
 
+    @staticmethod
+    def reference_ops(
+            circuit: cirq.Circuit | CompositeBloq | tuple
+            ) -> typing.Iterator:
+        '''
+            Decomposed reference operations
+            A tuple is taken to be an already decomposed circuit, allowing
+            one decomposition to be shared between several comparisons
+            Bloqs are decomposed as for the bloq side of the comparison
+        '''
+        if isinstance(circuit, tuple):
+            return iter(circuit)
+        return TestHelpers.bloq_ops(circuit)
+
+    @staticmethod
+    def decomposable(bloq):
+        '''
+            Resolves bloqs that generator_decompose cannot walk
+            Qualtran composite bloqs have no cirq decomposition of their own
+            and are converted to their cirq circuit
+            Parameterised bloqs are composed once and resolved in turn
+            Anything else is returned unchanged, so this may be applied once
+            and the result shared between several decompositions
+        '''
+        if isinstance(bloq, CompositeBloq):
+            return bloq.to_cirq_circuit()
+        if isinstance(bloq, Parameterised):
+            return [TestHelpers.decomposable(i) for i in bloq.compose()]
+        return bloq
+
+    @staticmethod
+    def bloq_ops(bloq: CompositeBloq | cirq.Circuit) -> typing.Iterator:
+        '''
+            Decomposed bloq operations
+        '''
+        return generator_decompose(TestHelpers.decomposable(bloq))
+
     @staticmethod
     def generator_equality(
-            circuit: cirq.Circuit,
+            circuit: cirq.Circuit | tuple,
             bloq: CompositeBloq 
             ) -> bool:
         '''
             Tests equality for generator decompose
+            :: circuit : cirq.Circuit | tuple :: Circuit or its decomposed ops
         '''
+        bloq_ops = TestHelpers.bloq_ops(bloq)
+
         # Test that the bloq is not empty
-        assert TestHelpers.non_empty(generator_decompose(bloq))
+        # The first op is re-attached rather than decomposing the bloq twice
+        first = next(bloq_ops, None)
+        assert first is not None
 
         # Test that all decomposition objects match  
-        return all(
-            map(
-                lambda x: x[0] == x[1],
-                zip(
-                    generator_decompose(bloq),
-                    generator_decompose(circuit)
-                )
+        # Length mismatches fail on the first unmatched object
+        return all(starmap(
+            eq, zip_longest(
+                chain((first,), bloq_ops),
+                TestHelpers.reference_ops(circuit),
+                fillvalue=_EXHAUSTED
             )
-        )
+        ))
 
     @staticmethod
     def circuit_equality(
@@ -85,80 +164,121 @@ class TestHelpers():
             :: bloq : Repeat :: Repeating Bloq Object
             :: decomp : int :: Number of decompositions for the decomp_multi
         '''
+        decomposed = circuit_decompose_multi(bloq, decomp)
+
         # Test that the bloq is not empty
-        assert TestHelpers.non_empty(iter(circuit_decompose_multi(bloq, decomp)))
+        assert TestHelpers.non_empty(iter(decomposed))
+
+        # Differing moment counts can never match, skip comparing moments
+        if len(circuit) != len(decomposed):
+            return False
     
         # Test that all decomposition objects match 
-        return all(
-            map(
-                lambda x: x[0] == x[1],
-                zip(
-                    circuit,
-                    circuit_decompose_multi(bloq, decomp)
-                )
+        # Length mismatches fail on the first unmatched moment
+        return all(starmap(
+            eq, zip_longest(
+                circuit,
+                decomposed,
+                fillvalue=_EXHAUSTED
             )
-        )
+        ))
 
     @staticmethod
     def generator_commutative_equality(
-            circuit: cirq.Circuit,
-            bloq: CompositeBloq 
+            circuit: cirq.Circuit | CompositeBloq | tuple,
+            bloq: CompositeBloq | cirq.Circuit
             ) -> bool:
         '''
             Tests equality for generator decompose
+            Either side may be a circuit or a bloq
             This resolves issues where the gates are out of order but commute
-            :: circuit : cirq.Circuit :: Repeated Circuit Object
+            :: circuit : cirq.Circuit | tuple :: Repeated Circuit Object or its
+                                                decomposed ops
             :: bloq : Repeat :: Repeating Bloq Object
         '''
 
+        # Both sides are walked up to twice, resolve any conversions once
+        circuit = TestHelpers.decomposable(circuit)
+        bloq = TestHelpers.decomposable(bloq)
+
+        bloq_ops = TestHelpers.bloq_ops(bloq)
+
         # Test that the bloq is not empty
-        assert TestHelpers.non_empty(generator_decompose(bloq))
+        # The first op is re-attached rather than decomposing the bloq twice
+        first = next(bloq_ops, None)
+        assert first is not None
+
+        # Strict order fast path, most decompositions are already in order
+        # Only mismatched streams are walked again with the backlog
+        if all(starmap(
+            eq, zip_longest(
+                chain((first,), bloq_ops),
+                TestHelpers.reference_ops(circuit),
+                fillvalue=_EXHAUSTED
+            )
+        )):
+            return True
+
+        # Backlogged gates as per qubit queues of (insertion index, gate)
+        # Each gate is queued on every qubit it touches, oldest first
+        backlog = defaultdict(deque)
+        n_backlogged = 0
 
-        backlog = []
         # Tracks the iterator for the decomposition of the circuit
-        gen = generator_decompose(circuit)
+        gen = TestHelpers.reference_ops(circuit)
 
         # Tracks the iterator for the decomposition of the repeating bloq
         # Not the happiest with the amount of GOTO-like structures here;
         # Python for loops lack grace
-        for bloq_gate in generator_decompose(bloq):
+        for bloq_gate in TestHelpers.bloq_ops(bloq):
 
             qubits = bloq_gate.qubits
+            qubit_set = frozenset(qubits)
             found = False
 
             # First check any backlogged gates
-            for cmp in backlog:
-                if any(i in cmp.qubits for i in qubits):
-                    # Gate resolution is out of order, bail
-                    if cmp != bloq_gate:
-                        return False
-                    found = cmp
-                    break
+            # The earliest backlogged gate touching these qubits is the
+            # oldest head of their queues
+            # Insertion indices are unique so gates are never compared here
+            heads = [backlog[i][0] for i in qubits if backlog.get(i)]
+            if heads:
+                _, cmp = min(heads)
+                # Gate resolution is out of order, bail
+                if cmp != bloq_gate:
+                    return False
 
-            # Gate was in commutative order in the backlog, continue
-            if found is not False:
-                backlog.remove(found)
+                # Gate was in commutative order in the backlog, continue
+                # A matching gate is the oldest entry on each of its qubits
+                for i in cmp.qubits:
+                    backlog[i].popleft()
                 continue
 
             # Gate was not in the backlog
             # Traverse the generator until we find the appropriate gate
             for cmp in gen:
+                cmp_qubits = cmp.qubits
 
                 # Gate resolution is out of order, bail
-                if any(i in cmp.qubits for i in qubits):
+                if not qubit_set.isdisjoint(cmp_qubits):
                     if cmp != bloq_gate:
                         return False
                     found = True
                     break
 
                 # Append non-matching gates to the backlog
-                backlog.append(cmp)
+                for i in cmp_qubits:
+                    backlog[i].append((n_backlogged, cmp))
+                n_backlogged += 1
 
             if not found:
                 return False
 
         # All gates were matched in order
-        return True
+        # Unmatched reference gates mean the bloq emitted too few gates
+        return (
+            not any(backlog.values())
+            and next(gen, _EXHAUSTED) is _EXHAUSTED
+        )
 
     @staticmethod
     def randomly_compose_bloqs(
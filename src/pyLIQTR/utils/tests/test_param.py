@@ -1,10 +1,11 @@
 '''
     Tests for the Param Bloq
 '''
+import sys
 import types
 import unittest
 
-from functools import partial
+from functools import lru_cache, partial
 
 import cirq
 from qualtran import CompositeBloq
@@ -16,6 +17,13 @@ from pyLIQTR.utils.circuit_decomposition import generator_decompose
 
 from pyLIQTR.utils.tests.test_helpers import TestHelpers, extract_and_run_tests
 
+from qualtran.bloqs.basic_gates import CNOT, Hadamard
+from qualtran import BloqBuilder
+
+# Shared gate instances for generate_bloqs
+_CX = CNOT()
+_H = Hadamard()
+
 
 class TestParamBloq(unittest.TestCase, TestHelpers):
     '''
@@ -23,36 +31,35 @@ class TestParamBloq(unittest.TestCase, TestHelpers):
     '''
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def generate_circuit(
             *,
             n_repetitions: int = 1,
             n_qubits: int = 2
-            ) -> cirq.Circuit:
+            ) -> cirq.FrozenCircuit:
         '''
         Generates a simple circuit to test on
+        Frozen so that it can be cached and shared across tests
         '''
-        circ = cirq.Circuit()
-        q = [cirq.LineQubit(i) for i in range(n_qubits)]
-
-        for _ in range(n_repetitions):
-            for i in range(n_qubits - 1):
-                circ.append(cirq.H(q[i]))
-                circ.append(cirq.CNOT(q[i], q[i + 1]))
-
-        return circ
+        q = TestParamBloq.line_qubits(n_qubits)
+
+        # Built in one pass rather than appending gate by gate
+        ops = (
+            op
+            for _ in range(n_repetitions)
+            for i in range(n_qubits - 1)
+            for op in (cirq.H(q[i]), cirq.CNOT(q[i], q[i + 1]))
+        )
+        return cirq.FrozenCircuit(ops, strategy=cirq.InsertStrategy.EARLIEST)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def generate_bloqs(
         *,
         n_repetitions: int = 1,
         n_qubits: int = 2
         ) -> None:
 
-        from qualtran.bloqs.basic_gates import CNOT, Hadamard
-        from qualtran import BloqBuilder
-        CX = CNOT()
-        H = Hadamard()
-
         bb = BloqBuilder() 
 
         qubits = [
@@ -62,14 +69,14 @@ class TestParamBloq(unittest.TestCase, TestHelpers):
         
         for _ in range(n_repetitions):
             for i in range(n_qubits - 1):
-                qubits[i] = bb.add(H, q=qubits[i])
-                qubits[i], qubits[i + 1] = bb.add(CX, ctrl=qubits[i], target=qubits[i + 1])
+                qubits[i] = bb.add(_H, q=qubits[i])
+                qubits[i], qubits[i + 1] = bb.add(_CX, ctrl=qubits[i], target=qubits[i + 1])
         cbloq=bb.finalize(**{f'q{i}':qubits[i] for i in range(len(qubits))})
         return cbloq
                 
     def test_cirq_unary_gate(self, n_qubits=10):
 
-        q = [cirq.LineQubit(i) for i in range(n_qubits)]
+        q = self.line_qubits(n_qubits)
         target_gate = cirq.H
         bloq = Parameterised(target_gate) 
 
@@ -98,7 +105,7 @@ class TestParamBloq(unittest.TestCase, TestHelpers):
         '''
             Tests multiple arguments
         '''
-        q = [cirq.LineQubit(i) for i in range(n_qubits)]
+        q = self.line_qubits(n_qubits)
         target_gate = cirq.CNOT
         bloq = Parameterised(target_gate) 
        
@@ -128,7 +135,7 @@ class TestParamBloq(unittest.TestCase, TestHelpers):
             Tests multiple arguments
             This test pre-binds some gate arguments
         '''
-        q = [cirq.LineQubit(i) for i in range(n_qubits)]
+        q = self.line_qubits(n_qubits)
         target_gate = cirq.ZPowGate
 
         targ = q[n_qubits - 1]
@@ -173,8 +180,8 @@ class TestParamBloq(unittest.TestCase, TestHelpers):
         param.bind_params(n_repetitions=2, n_qubits=n_qubits) 
       
         assert self.generator_commutative_equality(
-            circ.to_cirq_circuit(),
-            next(param.compose()).to_cirq_circuit()
+            circ,
+            next(param.compose())
         )
 
         assert self.generator_commutative_equality(
@@ -190,21 +197,28 @@ class TestParamBloq(unittest.TestCase, TestHelpers):
         circ = self.generate_circuit(n_qubits=n_qubits) 
         bloq = Parameterised(Repeat, circ)
 
+        # Decompose a single period of the reference once
+        # Each repeated reference is that period replayed
+        period_ops = tuple(generator_decompose(circ))
+
         for i in range(1, n_repetitions):
             repeat_circuit = self.generate_circuit(n_qubits=n_qubits, n_repetitions=i)
             repeat_bloq = Repeat(circ, n_repetitions=i)
 
             bloq.bind_params(n_repetitions=i)
 
+            # Shared by both commutative checks
+            repeat_ops = period_ops * i
+
             # Test generator_decompose and circuit_decompose_multi
             assert self.generator_commutative_equality(
-                repeat_circuit,
+                repeat_ops,
                 repeat_bloq
             )
 
             # Test generator_decompose and circuit_decompose_multi
             assert self.generator_commutative_equality(
-                repeat_circuit,
+                repeat_ops,
                 bloq,
             )
 
@@ -220,7 +234,27 @@ class TestParamBloq(unittest.TestCase, TestHelpers):
                 decomp = 2 # Needs two rounds of decomposition
             )
 
+    def test_bound_kwargs(self, n_qubits: int = 3, n_repetitions: int = 2):
+        '''
+            Tests composing without parameters and forwarding bound kwargs
+        '''
+        q = self.line_qubits(n_qubits)
+
+        # No parameters are required if all arguments are pre-bound
+        bloq = Parameterised(cirq.CNOT, q[0], q[1])
+        assert next(bloq.compose()) == cirq.CNOT(q[0], q[1])
+
+        # Bound kwargs such as caching are forwarded to the generated bloq
+        circ = self.generate_circuit(n_qubits=n_qubits)
+        bloq = Parameterised(Repeat, circ, caching=True)
+        bloq.bind_params(n_repetitions=n_repetitions)
+
+        repeat_bloq = next(bloq.compose())
+        assert repeat_bloq.caching
+        assert repeat_bloq.n_repetitions == n_repetitions
+
 # Test runner without invoking subprocesses
 # Used for interactive and pdb hooks
+# Pass -j to run the tests in parallel worker processes instead
 if __name__ == '__main__':
-    extract_and_run_tests(TestParamBloq())
+    extract_and_run_tests(TestParamBloq(), parallel='-j' in sys.argv[1:])
@@ -1,11 +1,16 @@
 '''
     Tests for the Repeat Bloq
 '''
+import sys
 import types
 import unittest
 
+from functools import lru_cache
+
 import cirq
 from qualtran import CompositeBloq
+from qualtran._infra.gate_with_registers import GateWithRegisters
+from qualtran._infra.registers import Signature
 from pyLIQTR.utils.repeat import Repeat
 from pyLIQTR.utils.repeat import circuit_to_quregs
 
@@ -20,23 +25,26 @@ class TestRepeatBloq(unittest.TestCase, TestHelpers):
     '''
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def generate_circuit(
             *,
             n_repetitions: int = 1,
             n_qubits: int = 2
-            ) -> cirq.Circuit:
+            ) -> cirq.FrozenCircuit:
         '''
         Generates a simple circuit to test on
+        Frozen so that it can be cached and shared across tests
         '''
-        circ = cirq.Circuit()
-        q = [cirq.LineQubit(i) for i in range(n_qubits)]
-
-        for _ in range(n_repetitions):
-            for i in range(n_qubits - 1):
-                circ.append(cirq.H(q[i]))
-                circ.append(cirq.CNOT(q[i], q[i + 1]))
-
-        return circ
+        q = TestRepeatBloq.line_qubits(n_qubits)
+
+        # Built in one pass rather than appending gate by gate
+        ops = (
+            op
+            for _ in range(n_repetitions)
+            for i in range(n_qubits - 1)
+            for op in (cirq.H(q[i]), cirq.CNOT(q[i], q[i + 1]))
+        )
+        return cirq.FrozenCircuit(ops, strategy=cirq.InsertStrategy.EARLIEST)
     
     def test_bloq(self, n_qubits: int = 5, n_repetitions: int = 7):
         '''
@@ -49,7 +57,9 @@ class TestRepeatBloq(unittest.TestCase, TestHelpers):
             n_qubits=n_qubits
         )
 
-        quregs = circuit_to_quregs(circ)
+        # The generated circuit acts on a known line of qubits
+        # No need to scan the circuit with circuit_to_quregs
+        quregs = {'qubits': [[q] for q in self.line_qubits(n_qubits)]}
         bloq = CompositeBloq.from_cirq_circuit(circ)
         repeat_bloq = Repeat(
             bloq,
@@ -119,7 +129,97 @@ class TestRepeatBloq(unittest.TestCase, TestHelpers):
             repeat_bloq
         )
 
+    def test_circuit_cached(self, n_repetitions: int = 6, n_qubits: int = 3):
+        '''
+            Heavily repeated circuits are cached and replayed
+        '''
+        circ = self.generate_circuit(n_qubits=n_qubits)
+        repeated_circuit = self.generate_circuit(
+            n_repetitions=n_repetitions,
+            n_qubits=n_qubits
+        )
+
+        repeat_bloq = Repeat(circ, n_repetitions=n_repetitions)
+        assert repeat_bloq.caching
+
+        assert self.generator_commutative_equality(
+            repeated_circuit,
+            repeat_bloq
+        )
+        assert self.circuit_equality(
+            repeated_circuit,
+            repeat_bloq
+        )
+
+        # Decomposing again replays the cache
+        assert list(repeat_bloq.decompose()) == n_repetitions * list(
+            circ.all_operations()
+        )
+
+        # Caching may still be explicitly disabled
+        assert not Repeat(circ, n_repetitions=n_repetitions, caching=False).caching
+
+        # Mutable circuits are not cached, so changes are reflected
+        mutable_circ = circ.unfreeze()
+        repeat_bloq = Repeat(mutable_circ, n_repetitions=n_repetitions)
+        assert not repeat_bloq.caching
+
+        mutable_circ.append(cirq.X(self.line_qubits(n_qubits)[0]))
+        assert list(repeat_bloq.decompose()) == n_repetitions * list(
+            mutable_circ.all_operations()
+        )
+
+    def test_circuit_to_quregs(self, n_qubits: int = 4):
+        '''
+            Frozen and mutable circuits give the same quregs
+            Mutating returned quregs does not affect later calls
+        '''
+        frozen_circ = self.generate_circuit(n_qubits=n_qubits)
+        mutable_circ = frozen_circ.unfreeze()
+
+        quregs = circuit_to_quregs(frozen_circ)
+        assert quregs == circuit_to_quregs(mutable_circ)
+        assert quregs == {
+            'qubits': [[q] for q in self.line_qubits(n_qubits)]
+        }
+
+        # Mutate the returned quregs
+        quregs['qubits'][0].append(cirq.LineQubit(n_qubits))
+        quregs['qubits'].pop()
+        quregs['extra'] = []
+
+        assert circuit_to_quregs(frozen_circ) == circuit_to_quregs(mutable_circ)
+
+    def test_decompose_from_registers(self, n_repetitions: int = 3):
+        '''
+            Tests that register decompositions are emitted on every repetition
+        '''
+
+        class XGate(GateWithRegisters):
+            # Single qubit gate decomposing to an X
+            @property
+            def signature(self) -> Signature:
+                return Signature.build(q=1)
+
+            def decompose_from_registers(self, *, context, q):
+                yield cirq.X(*q)
+
+        qubits = cirq.LineQubit.range(1)
+        context = cirq.DecompositionContext(cirq.ops.SimpleQubitManager())
+
+        for caching in (False, True):
+            repeat_bloq = Repeat(
+                XGate(),
+                n_repetitions=n_repetitions,
+                caching=caching
+            )
+            ops = list(
+                repeat_bloq.decompose_from_registers(context=context, q=qubits)
+            )
+            assert ops == [cirq.X(qubits[0])] * n_repetitions
+
 # Test runner without invoking subprocesses
 # Used for interactive and pdb hooks
+# Pass -j to run the tests in parallel worker processes instead
 if __name__ == '__main__':
-    extract_and_run_tests(TestRepeatBloq())
+    extract_and_run_tests(TestRepeatBloq(), parallel='-j' in sys.argv[1:])